@@ -17,7 +17,6 @@ import enum
 import json
 from typing import List, Optional
 from pathlib import Path
-from collections import ChainMap
 
 
 CONFIG_SCHEMA_VERSION = 4
@@ -63,12 +62,10 @@ class ConfigValidator:
         self._version = None
     
     def load(self, paths: List[Optional[Path]]) -> dict:
-        cm = ChainMap()
+        merged = {}
         
         if len(paths):
             for path in paths:
-                if not os.path.exists(path):
-                    raise ConfigError(ErrorType.NOT_FOUND, file=path)
                 try:
                     with open(path) as f:
                         file_data = json.load(f)
@@ -85,20 +82,20 @@ class ConfigValidator:
                             
                             self._version = file_version
                         
-                        for root_node in file_data.keys():
-                            if root_node in cm.keys():
+                        for root_node in file_data:
+                            if root_node in merged:
                                 raise ConfigError(ErrorType.DUPLICATE_ROOT_NODE, file=path, node_name=root_node)
                         
-                        cm.update(file_data)
+                        merged.update(file_data)
+                except FileNotFoundError:
+                    raise ConfigError(ErrorType.NOT_FOUND, file=path)
                 except OSError as e:
                     raise ConfigError(ErrorType.CANNOT_READ, file=path, underlying=e)
         else:
             raise ConfigError(ErrorType.NO_PATHS)
         
-        final_data = dict(cm)
-        
         # try:
-        #     jsonschema.validate(final_data, self._schema)
+        #     jsonschema.validate(merged, self._schema)
         # except SchemaError as e:
         #     raise ConfigError(ErrorType.SCHEMA_INVALID, message=e.message)
         # except ValidationError as e:
@@ -107,7 +104,7 @@ class ConfigValidator:
         #                       validator=e.validator_value,
         #                       node_path=e.json_path)
         
-        return final_data
+        return merged
 
 
 def get_config_schema_path() -> str:
@@ -16,17 +16,71 @@ import random
 from atsc.core import *
 from atsc import logic, network, constants, serialbus
 from loguru import logger
-from typing import Set, Iterable
+from typing import Tuple, Callable, Iterable, FrozenSet
 from bitarray import bitarray
-from itertools import chain
-from atsc.utils import build_field_message
+from bisect import insort
+from operator import attrgetter
+from atsc.utils import build_field_message, cached_text_to_enum
 from jacob.text import post_pend
 from atsc.frames import FrameType, DeviceAddress, OutputStateFrame
-from collections import defaultdict
-from jacob.enumerations import text_to_enum
+from collections import Counter, defaultdict
+
+
+# phase IDs follow configuration order, so this keeps lists in `phases` order
+PHASE_ID_KEY = attrgetter('id')
+INTERVAL_ELAPSED_KEY = attrgetter('interval_elapsed')
+# upper bound of bus frames handled in one tick. it matches the receive queue
+# depth, so every frame queued at the start of a tick is drained within it and
+# the inputs acted on are never older than the tick
+BUS_FRAMES_PER_TICK = serialbus.Bus.RX_QUEUE_SIZE
 
 
 class Controller:
+    __slots__ = ('name',
+                 'recall_all_enabled',
+                 'running',
+                 'transferred',
+                 'mode',
+                 'mode_handlers',
+                 'load_switches',
+                 'load_switch_by_id',
+                 'field_signature',
+                 'phases',
+                 'phase_by_id',
+                 'phases_mask',
+                 'phase_pool_mask',
+                 'phase_history',
+                 'highest_phase_id',
+                 'active_phases',
+                 'active_mask',
+                 'rings',
+                 'concurrent_phases',
+                 'barriers',
+                 'barrier',
+                 'barrier_by_phase_id',
+                 'barrier_masks',
+                 'friend_matrix',
+                 'conflict_masks',
+                 'partners_by_id',
+                 'calls',
+                 'call_counts',
+                 'called_mask',
+                 'cycle_count',
+                 'idle_phases',
+                 'cet_timer',
+                 'input_bitfield',
+                 'input_payload',
+                 'inputs',
+                 'input_list',
+                 'input_edge_handlers',
+                 'phase_inputs',
+                 'bus',
+                 'monitor',
+                 'random_enabled',
+                 'random_min',
+                 'random_max',
+                 'randomizer',
+                 'random_timer')
     
     @property
     def idling(self):
@@ -46,24 +100,55 @@ class Controller:
         self.transferred = False
         
         # operation functionality of the controller
-        self.mode: OperationMode = text_to_enum(OperationMode, config['init']['mode'])
-        
-        self.load_switches: List[LoadSwitch] = [LoadSwitch(1), LoadSwitch(2), LoadSwitch(3), LoadSwitch(4),
-                                                LoadSwitch(5), LoadSwitch(6), LoadSwitch(7), LoadSwitch(8),
-                                                LoadSwitch(9), LoadSwitch(10), LoadSwitch(11), LoadSwitch(12)]
-        
-        default_timing = self.get_default_timing(config['default-timing'])
+        self.mode: OperationMode = cached_text_to_enum(OperationMode, config['init']['mode'])
+        # per-mode work done every tick, modes without a handler only idle
+        self.mode_handlers: Dict[OperationMode, Callable[[], None]] = {
+            OperationMode.NORMAL: self.tick_normal,
+            OperationMode.CET: self.tick_cet
+        }
+        
+        self.load_switches: List[LoadSwitch] = [LoadSwitch(i) for i in range(1, 13)]
+        self.load_switch_by_id: Dict[int, LoadSwitch] = {ls.id: ls for ls in self.load_switches}
+        # load switch outputs as of the last logged field message
+        self.field_signature: Optional[Tuple[Tuple[bool, bool, bool], ...]] = None
+        
+        default_timing = self.get_timing(config['default-timing'])
         self.phases: List[Phase] = self.get_phases(config['phases'], default_timing)
-        self.phase_pool: List[Phase] = self.phases.copy()
-        self.phase_history: List[Phase] = []
-        self.rings: List[Ring] = self.get_rings(config['rings'])
-        self.barriers: List[Barrier] = self.get_barriers(config['barriers'])
+        self.phase_by_id: Dict[int, Phase] = {ph.id: ph for ph in self.phases}
+        # bit N set for every configured phase
+        self.phases_mask: int = sum(1 << ph.id for ph in self.phases)
+        # bit N set while phase N has yet to be served this cycle
+        self.phase_pool_mask: int = self.phases_mask
+        # phases served this cycle in service order, dict keys as an ordered set
+        self.phase_history: Dict[Phase, None] = {}
+        self.highest_phase_id: int = 0
+        # active phases ordered by ID, kept current by serve_phase and tick
+        self.active_phases: List[Phase] = []
+        # bit N set while phase N is active, mirrors active_phases
+        self.active_mask: int = 0
+        self.rings: Tuple[Ring, ...] = self.get_rings(config['rings'])
+        # one phase per ring may run at once
+        self.concurrent_phases: int = len(self.rings)
+        self.barriers: Tuple[Barrier, ...] = self.get_barriers(config['barriers'])
         self.barrier: Optional[Barrier] = None
-        self.friend_matrix: Dict[int, List[int]] = self.generate_friend_matrix(self.rings, self.barriers)
+        self.barrier_by_phase_id: Dict[int, Barrier] = {i: b for b in self.barriers for i in b.phases}
+        self.barrier_masks: Dict[int, int] = {b.id: sum(1 << i for i in b.phases) for b in self.barriers}
+        # ordered partner IDs for selection, frozensets for membership tests
+        partner_ids: Dict[int, List[int]] = self.generate_friend_matrix(self.rings, self.barriers)
+        self.friend_matrix: Dict[int, FrozenSet[int]] = defaultdict(frozenset, {
+            k: frozenset(v) for k, v in partner_ids.items()
+        })
+        self.conflict_masks: Dict[int, int] = self.generate_conflict_masks(self.phases, self.friend_matrix)
+        self.partners_by_id: Dict[int, Tuple[Phase, ...]] = {ph.id: tuple(self.get_phases_by_id(partner_ids[ph.id]))
+                                                             for ph in self.phases}
         
         self.calls: List[Call] = []
+        # number of calls each phase currently appears in
+        self.call_counts: Dict[Phase, int] = Counter()
+        # bit N set while phase N appears in any call, mirrors call_counts
+        self.called_mask: int = 0
         self.cycle_count = 0
-        self.idle_phases: List[Phase] = self.get_idle_phases(config['idling']['phases'])
+        self.idle_phases: FrozenSet[Phase] = self.get_idle_phases(config['idling']['phases'])
         
         # control entrance transition timer
         yellow_time = default_timing[PhaseState.CAUTION]
@@ -72,8 +157,16 @@ class Controller:
         
         # inputs data structure instances
         self.input_bitfield = bitarray()
+        self.input_payload: bytes = b''
         self.inputs: Dict[int, Input] = self.get_inputs(config.get('inputs'))
-        self.phase_inputs: Dict[Phase, Set[Input]] = self.get_phase_inputs()
+        # inputs in bitfield order
+        self.input_list: Tuple[Input, ...] = tuple(self.inputs.values())
+        # edge handlers keyed by the status returned from `Input.poll()`
+        self.input_edge_handlers: Dict[int, Callable[[Input], None]] = {
+            1: self.input_rising,
+            -1: self.input_falling
+        }
+        self.phase_inputs: Dict[Phase, Tuple[Input, ...]] = self.get_phase_inputs()
         
         # communications
         self.bus: Optional[serialbus.Bus] = self.get_bus(config['bus'])
@@ -85,15 +178,12 @@ class Controller:
         self.random_enabled = random_config['enabled']
         self.random_min = random_config['min']
         self.random_max = random_config['max']
-        self.randomizer = random.Random()
+        self.randomizer = random.Random(random_config.get('seed'))
         self.random_timer = logic.Timer(random_delay)
     
-    def get_default_timing(self, configuration_node: Dict[str, float]) -> Dict[PhaseState, float]:
-        timing = {}
-        for name, value in configuration_node.items():
-            ps = text_to_enum(PhaseState, name)
-            timing.update({ps: value})
-        return timing
+    def get_timing(self, configuration_node: Dict[str, float]) -> Dict[PhaseState, float]:
+        """Map the interval names of a timing node to `PhaseState` keys"""
+        return {cached_text_to_enum(PhaseState, name): value for name, value in configuration_node.items()}
     
     def get_phases(self,
                    configuration_node: List[Dict],
@@ -102,14 +192,13 @@ class Controller:
         
         for i, node in enumerate(configuration_node, start=1):
             flash_mode_text = node['flash-mode']
-            flash_mode = text_to_enum(FlashMode, flash_mode_text)
-            phase_timing: Dict[PhaseState, float] = default_timing.copy()
+            flash_mode = cached_text_to_enum(FlashMode, flash_mode_text)
             timing_data = node.get('timing')
             
             if timing_data is not None:
-                for name, value in timing_data.items():
-                    ps = text_to_enum(PhaseState, name)
-                    phase_timing.update({ps: value})
+                phase_timing = {**default_timing, **self.get_timing(timing_data)}
+            else:
+                phase_timing = default_timing.copy()
             
             ls_node = node['load-switches']
             veh = ls_node['vehicle']
@@ -121,19 +210,14 @@ class Controller:
             phase = Phase(i, phase_timing, veh, ped, flash_mode)
             phases.append(phase)
         
-        return sorted(phases)
+        # IDs are assigned in configuration order, so phases are already sorted
+        return phases
     
-    def get_rings(self, configuration_node: List[List[int]]) -> List[Ring]:
-        rings = []
-        for i, n in enumerate(configuration_node, start=1):
-            rings.append(Ring(i, n))
-        return rings
+    def get_rings(self, configuration_node: List[List[int]]) -> Tuple[Ring, ...]:
+        return tuple(Ring(i, n) for i, n in enumerate(configuration_node, start=1))
     
-    def get_barriers(self, configuration_node: List[List[int]]) -> List[Barrier]:
-        barriers = []
-        for i, n in enumerate(configuration_node, start=1):
-            barriers.append(Barrier(i, n))
-        return barriers
+    def get_barriers(self, configuration_node: List[List[int]]) -> Tuple[Barrier, ...]:
+        return tuple(Barrier(i, n) for i, n in enumerate(configuration_node, start=1))
     
     def get_bus(self, configuration_node: dict) -> Optional[serialbus.Bus]:
         """Create the serial bus manager thread, if enabled"""
@@ -178,14 +262,14 @@ class Controller:
         logger.info('Networking disabled')
         return None
     
-    def generate_friend_matrix(self, rings: List[Ring], barriers: Iterable[Barrier]) -> Dict[int, List[int]]:
+    def generate_friend_matrix(self, rings: Tuple[Ring, ...], barriers: Iterable[Barrier]) -> Dict[int, List[int]]:
         matrix = defaultdict(list)
         ring_indices = defaultdict(int)
         
-        for ring in rings:
+        for ring_index, ring in enumerate(rings):
             for phase in ring.phases:
                 assert isinstance(phase, int) and phase > 0
-                ring_indices[phase] = rings.index(ring)
+                ring_indices[phase] = ring_index
         
         for barrier in barriers:
             for phase in barrier.phases:
@@ -196,28 +280,45 @@ class Controller:
         
         return matrix
     
+    def generate_conflict_masks(self, phases: List[Phase], friend_matrix: Dict[int, FrozenSet[int]]) -> Dict[int, int]:
+        """
+        Pack the phases that may not run alongside each phase into an integer
+        bitmask, where bit N is set when phase N conflicts.
+
+        :param phases: all phases of the controller
+        :param friend_matrix: phase ID to IDs of phases allowed to run with it
+        :return: a map of phase ID to conflict bitmask
+        """
+        all_mask = sum(1 << phase.id for phase in phases)
+        masks = {}
+        
+        for phase in phases:
+            # friends are the barrier's phases outside this phase's ring,
+            # everything else other than the phase itself conflicts
+            allowed = sum(1 << i for i in friend_matrix[phase.id]) | 1 << phase.id
+            masks[phase.id] = all_mask & ~allowed
+        
+        return masks
+    
     def get_phase_by_id(self, i: int) -> Phase:
-        for ph in self.phases:
-            if ph.id == i:
-                return ph
-        raise RuntimeError(f'Failed to find phase {i}')
+        try:
+            return self.phase_by_id[i]
+        except KeyError:
+            raise RuntimeError(f'Failed to find phase {i}')
     
-    def get_phases_by_id(self, indices: List[int]) -> List[Phase]:
-        phases = []
-        for i in indices:
-            phases.append(self.get_phase_by_id(i))
-        return phases
+    def get_phases_by_id(self, indices: Iterable[int]) -> List[Phase]:
+        phase_by_id = self.phase_by_id
+        try:
+            return [phase_by_id[i] for i in indices]
+        except KeyError as e:
+            raise RuntimeError(f'Failed to find phase {e.args[0]}')
     
     def get_load_switch_by_id(self, i: int) -> LoadSwitch:
-        for ls in self.load_switches:
-            if ls.id == i:
-                return ls
-        raise RuntimeError(f'Failed to find load switch {i}')
+        try:
+            return self.load_switch_by_id[i]
+        except KeyError:
+            raise RuntimeError(f'Failed to find load switch {i}')
 
-    def get_barrier_phases(self, barrier: Barrier) -> List[Phase]:
-        """Map the phase indices defined in a `Barrier` to `Phase` instances"""
-        return self.get_phases_by_id(barrier.phases)
-    
     def get_inputs(self, config: Optional[dict]) -> Dict[int, Input]:
         """
         Transform input settings from configuration node into a list of `Input`
@@ -235,7 +336,7 @@ class Controller:
                 if id_ in inputs:
                     raise RuntimeError(f'input {id_} already defined')
                 
-                action = text_to_enum(InputAction, node['action'])
+                action = cached_text_to_enum(InputAction, node['action'])
                 
                 del node['id']
                 del node['action']
@@ -244,7 +345,7 @@ class Controller:
         
         return inputs
     
-    def get_phase_inputs(self) -> Dict[Phase, Set[Input]]:
+    def get_phase_inputs(self) -> Dict[Phase, Tuple[Input, ...]]:
         mapping = defaultdict(set)
         
         for input_ in self.inputs.values():
@@ -252,26 +353,39 @@ class Controller:
                 for phase in self.get_phases_by_id(input_.targets):
                     mapping[phase].add(input_)
         
-        return mapping
+        # plain dict of tuples, read with .get() so lookups never insert
+        return {phase: tuple(inputs) for phase, inputs in mapping.items()}
     
-    def get_idle_phases(self, items: List[int]) -> List[Phase]:
-        phases = []
-        for item in items:
-            phases.append(self.get_phase_by_id(item))
-        return phases
+    def get_idle_phases(self, items: List[int]) -> FrozenSet[Phase]:
+        return frozenset(self.get_phases_by_id(items))
     
-    def get_highest_phase_id(self) -> int:
-        if not self.phase_history:
-            return 0
-        
-        return max([p.id for p in self.phase_history])
+    def count_call_phase(self, phase: Phase):
+        """Record one more call occurrence of a phase in the demand index"""
+        if not self.call_counts[phase]:
+            self.called_mask |= 1 << phase.id
+        self.call_counts[phase] += 1
+    
+    def uncount_call_phase(self, phase: Phase):
+        """Release one call occurrence of a phase from the demand index"""
+        remaining = self.call_counts[phase] - 1
+        if remaining > 0:
+            self.call_counts[phase] = remaining
+        else:
+            del self.call_counts[phase]
+            self.called_mask &= ~(1 << phase.id)
     
     def cleanup_calls(self):
-        for call in [c for c in self.calls if not len(c.phases)]:
-            self.calls.remove(call)
+        self.calls = [c for c in self.calls if c.phases]
+    
+    def get_call_friend_ids(self, call: Call) -> FrozenSet[int]:
+        """IDs of phases allowed to run alongside any phase of a call, cached on the call"""
+        if call.friend_ids is None:
+            call.friend_ids = frozenset().union(*(self.friend_matrix[p.id] for p in call.phases))
+        return call.friend_ids
     
-    def sort_calls(self, calls: Iterable[Call]) -> List[Call]:
-        return sorted(calls, key=lambda c: min([p.id for p in c.phases]))
+    def sort_calls(self):
+        """Order calls in place by their lowest phase ID"""
+        self.calls.sort(key=lambda c: min(p.id for p in c.phases))
     
     def recall(self, phases: Iterable[Phase], ped_service: bool = False, note: Optional[str] = None):
         """
@@ -282,132 +396,125 @@ class Controller:
         :param note: arbitrary note to be appended to log message
         """
         assert phases
-        note_text = post_pend(note, note)
         
         phases = set(phases)
-        merged = set()
+        concurrent_phases = self.concurrent_phases
         for call in self.calls:
-            for call_phase in call.phases:
-                for up in phases:
-                    if up.id in self.friend_matrix[call_phase.id]:
-                        if len(call.phases) < len(self.rings):
-                            logger.debug('Recall {} merged with {}',
-                                         up.get_tag(),
-                                         csl([p.get_tag() for p in call.phases]))
-                            call.phases.append(up)
-                            merged.add(up)
-                        else:
-                            break
-                if len(call.phases) >= len(self.rings):
-                    break
-            phases -= merged
+            if not phases:
+                break
+            
+            room = concurrent_phases - len(call.phases)
+            if room <= 0:
+                continue
+            
+            friend_ids = self.get_call_friend_ids(call)
+            merged = [up for up in phases if up.id in friend_ids][:room]
+            if not merged:
+                continue
+            
+            logger.opt(lazy=True).debug(
+                'Recall {} merged with {}',
+                lambda: csl([p.get_tag() for p in merged]),
+                lambda: csl([p.get_tag() for p in call.phases])
+            )
+            call.phases.extend(merged)
+            call.friend_ids = None
+            for up in merged:
+                self.count_call_phase(up)
+            phases.difference_update(merged)
         
         if phases:
             call = Call(phases, ped_service=ped_service)
-            logger.debug(f'Recalling {call.phase_tags_list}{note_text}')
+            logger.opt(lazy=True).debug('Recalling {}{}',
+                                        lambda: call.phase_tags_list,
+                                        lambda: post_pend(note, note))
             self.calls.append(call)
+            for phase in call.phases:
+                self.count_call_phase(phase)
         
         for phase in phases:
-            phase.stats['detections'] += 1
+            phase.detections += 1
         
         self.cleanup_calls()
-        self.sort_calls(self.calls)
+        self.sort_calls()
     
     def recall_all(self):
         """Place calls on all phases"""
         self.recall(self.phases, ped_service=True, note='all call')
     
     def detect(self, phases: List[Phase], ped_service: bool = False, note: Optional[str] = None):
-        note_text = post_pend(note, note)
-        
-        if all([phase.state not in PHASE_GO_STATES for phase in phases]):
+        if not any(phase.state in PHASE_GO_STATES for phase in phases):
             self.recall(phases, ped_service=ped_service, note=note)
         else:
             for phase in phases:
                 if phase.state in PHASE_GO_STATES:
-                    logger.debug(f'Detection on {phase.get_tag()}{note_text}')
+                    logger.opt(lazy=True).debug('Detection on {}{}',
+                                                phase.get_tag,
+                                                lambda: post_pend(note, note))
                     
                     if phase.extend_active:
                         phase.gap_reset()
                     
-                    phase.stats['detections'] += 1
+                    phase.detections += 1
                 else:
                     self.recall(phases, ped_service=ped_service, note=note)
     
-    def check_phase_demand(self, phase: Phase) -> bool:
-        for call in self.calls:
-            if phase in call.phases:
-                return True
-        return False
-    
-    def get_available_phases(self, active_phases: Iterable[Phase]) -> List[Phase]:
+    def get_available_phases(self) -> List[Phase]:
         available = []
         
-        pool = self.phase_pool
+        active_mask = self.active_mask
+        
+        # pool, demand and barrier narrowed with one AND, conflicts are a
+        # single bit test per candidate
+        candidates = self.phase_pool_mask & self.called_mask
         if self.barrier:
-            barrier_pool = self.get_barrier_phases(self.barrier)
-            pool = set(pool).intersection(barrier_pool)
+            candidates &= self.barrier_masks[self.barrier.id]
+        conflict_masks = self.conflict_masks
+        highest_id = self.highest_phase_id
         
-        for phase in pool:
+        for phase in self.phases:
+            phase_id = phase.id
+            if not candidates >> phase_id & 1:
+                continue
+            
             if not phase.active:
                 if phase.state in (PhaseState.CAUTION, PhaseState.EXTEND):
                     continue
                     
-                if phase.id < self.get_highest_phase_id():
-                    continue
-                
-                conflict = False
-                for active_phase in active_phases:
-                    if active_phase.id not in self.friend_matrix[phase.id]:
-                        conflict = True
-                        break
-                
-                if conflict:
+                if phase_id < highest_id:
                     continue
                 
-                if not self.check_phase_demand(phase):
+                if conflict_masks[phase_id] & active_mask:
                     continue
                 
                 available.append(phase)
         
         return available
     
-    def get_phase_partners(self, phase: Phase) -> List[Phase]:
-        return self.get_phases_by_id(self.friend_matrix[phase.id])
+    def get_phase_partners(self, phase: Phase) -> Tuple[Phase, ...]:
+        return self.partners_by_id[phase.id]
     
     def select_phase_partner(self, phase: Phase, pool: Optional[Iterable[Phase]] = None) -> Optional[Phase]:
         partners = self.get_phase_partners(phase)
         
-        for candidate in sorted(partners, key=lambda c: c.interval_elapsed, reverse=True):
-            if candidate.active:
-                continue
-            
-            if pool and candidate not in pool:
-                continue
-            
-            return candidate
-        return None
-    
-    def check_phase_conflict(self, a: Phase, b: Phase) -> bool:
-        """Check weather phase B conflicts with phase A."""
-        if a.id == b.id:
-            return False
-        
-        return b.id not in self.friend_matrix[a.id]
+        candidates = [c for c in partners if not c.active and (not pool or c in pool)]
+        # first of the longest waiting, same pick as a stable descending sort
+        return max(candidates, key=INTERVAL_ELAPSED_KEY, default=None)
     
     def check_conflicting_demand(self, phase: Phase, pool: Iterable[Phase] = None) -> bool:
-        for other_phase in pool or self.phases:
-            if other_phase == phase:
-                pass
-            if self.check_phase_demand(other_phase) and self.check_phase_conflict(phase, other_phase):
-                return True
-        return False
+        conflicting = self.conflict_masks[phase.id] & self.called_mask
+        if conflicting and pool:
+            pool_mask = 0
+            for other_phase in pool:
+                pool_mask |= 1 << other_phase.id
+            conflicting &= pool_mask
+        return bool(conflicting)
     
     def set_barrier(self, b: Optional[Barrier]):
         if b is not None:
-            logger.debug(f'{b.get_tag()} activated')
+            logger.opt(lazy=True).debug('{} activated', b.get_tag)
         else:
-            logger.verbose(f'Free barrier')
+            logger.verbose('Free barrier')
         
         self.barrier = b
     
@@ -415,8 +522,9 @@ class Controller:
         return [phase for phase in self.phases if phase.active]
     
     def reset_phase_pool(self):
-        self.phase_pool = self.phases.copy()
-        self.phase_history = []
+        self.phase_pool_mask = self.phases_mask
+        self.phase_history = {}
+        self.highest_phase_id = 0
         
         logger.verbose('Reset phase pool')
     
@@ -426,51 +534,55 @@ class Controller:
         self.cycle_count += 1
         self.set_barrier(None)
         
-        logger.debug(f'Ended cycle {self.cycle_count}')
+        logger.debug('Ended cycle {}', self.cycle_count)
     
     def get_barrier_by_phase(self, phase: Phase) -> Barrier:
         """Get `Barrier` instance by associated `Phase` instance"""
         assert isinstance(phase, Phase)
-        for b in self.barriers:
-            if phase.id in b.phases:
-                return b
-        
-        raise RuntimeError(f'Failed to get barrier by {phase.get_tag()}')
+        try:
+            return self.barrier_by_phase_id[phase.id]
+        except KeyError:
+            raise RuntimeError(f'Failed to get barrier by {phase.get_tag()}')
     
     def serve_phase(self,
                     phase: Phase,
                     ped_service: bool,
                     go_override: float = 0.0,
                     extend_inhibit: bool = False):
-        logger.debug(f'Serving phase {phase.get_tag()}')
+        logger.opt(lazy=True).debug('Serving phase {}', phase.get_tag)
         
         if self.barrier is None:
             barrier = self.get_barrier_by_phase(phase)
-            logger.debug('{} captured {}',
-                         phase.get_tag(),
-                         barrier.get_tag())
+            logger.opt(lazy=True).debug('{} captured {}',
+                                        phase.get_tag,
+                                        barrier.get_tag)
             self.set_barrier(barrier)
         
-        try:
-            self.phase_pool.remove(phase)
-        except ValueError:
-            pass
+        self.phase_pool_mask &= ~(1 << phase.id)
         
         if phase not in self.phase_history:
-            self.phase_history.append(phase)
+            self.phase_history[phase] = None
+            if phase.id > self.highest_phase_id:
+                self.highest_phase_id = phase.id
         
         phase.ped_service = ped_service
         phase.go_override = go_override
         phase.extend_inhibit = extend_inhibit
         phase.activate()
-    
-    def get_called_phases(self):
-        return chain(*[call.phases for call in self.calls])
+        
+        if phase not in self.active_phases:
+            insort(self.active_phases, phase, key=PHASE_ID_KEY)
+            self.active_mask |= 1 << phase.id
     
     def remove_phase_call(self, phase: Phase) -> bool:
+        if phase not in self.call_counts:
+            return False
+        
         for call in self.calls:
             try:
                 call.phases.remove(phase)
+                call.friend_ids = None
+                self.uncount_call_phase(phase)
                 return True
             except ValueError:
                 pass
@@ -487,44 +599,56 @@ class Controller:
     def poll_inputs(self):
         """Process the bus input bitfield"""
         input_: Input
-        for bit_value, input_ in zip(self.input_bitfield, self.inputs.values()):
+        # unpack the field in one go rather than boxing a bit per iteration
+        for bit_value, input_ in zip(self.input_bitfield.tolist(), self.input_list):
             input_.signal = bool(bit_value)
             status = input_.poll()
             
             if not input_.recalled and input_.signal and input_.action == InputAction.RECALL:
-                if input_.high_elapsed > input_.recall_delay or not self.get_active_phases():
+                if input_.high_elapsed > input_.recall_delay or not self.active_phases:
                     phases = self.get_phases_by_id(input_.targets)
                     self.detect(phases,
                                 ped_service=input_.ped_service,
                                 note=f'input {input_.id}')
                     input_.recalled = True
             
-            match status:
-                case 1:
-                    logger.verbose('Input {} rising (was low for {}s)',
-                                   input_.id,
-                                   round(input_.low_elapsed, 1))
-                    input_.recalled = False
-                case -1:
-                    logger.verbose('Input {} falling (was high for {}s)',
-                                   input_.id,
-                                   round(input_.high_elapsed, 1))
-                    
-                    if input_.action == InputAction.RECALL and input_.recall_type == RecallType.MAINTAIN:
-                        phases = self.get_phases_by_id(input_.targets)
-                        for phase in phases:
-                            logger.debug('Removing phase {} from calls', phase.get_tag())
-                            self.remove_phase_call(phase)
-
+            # steady inputs only need their timers polled above
+            if status:
+                self.input_edge_handlers[status](input_)
+    
+    def input_rising(self, input_: Input):
+        logger.verbose('Input {} rising (was low for {}s)',
+                       input_.id,
+                       round(input_.low_elapsed, 1))
+        input_.recalled = False
+    
+    def input_falling(self, input_: Input):
+        logger.verbose('Input {} falling (was high for {}s)',
+                       input_.id,
+                       round(input_.high_elapsed, 1))
+        
+        if input_.action == InputAction.RECALL and input_.recall_type == RecallType.MAINTAIN:
+            phases = self.get_phases_by_id(input_.targets)
+            for phase in phases:
+                logger.opt(lazy=True).debug('Removing phase {} from calls', phase.get_tag)
+                self.remove_phase_call(phase)
+    
     def poll_bus(self):
-        frame = self.bus.get()
-        
-        if frame is not None:
+        """Handle the frames the bus has decoded since the last tick, up to
+        `BUS_FRAMES_PER_TICK`, a full receive queue"""
+        for _ in range(BUS_FRAMES_PER_TICK):
+            frame = self.bus.get()
+            if frame is None:
+                break
+            
             match frame.type:
                 case FrameType.INPUTS:
-                    bf = bitarray()
-                    bf.frombytes(frame.payload)
-                    self.input_bitfield = bf
+                    # inputs are resent every poll, only unpack them on change
+                    if frame.payload != self.input_payload:
+                        # refill the existing field rather than allocating one
+                        self.input_bitfield.clear()
+                        self.input_bitfield.frombytes(frame.payload)
+                        self.input_payload = frame.payload
                 
     def update_bus_outputs(self, lss: List[LoadSwitch]):
         osf = OutputStateFrame(DeviceAddress.TFIB1, lss, self.transferred)
@@ -550,6 +674,9 @@ class Controller:
             if self.idle_phases:
                 self.recall(self.idle_phases, ped_service=True, note='idle phases')
         
+        self.active_phases = self.get_active_phases()
+        self.active_mask = sum(1 << ph.id for ph in self.active_phases)
+        
         previous_state = self.mode
         self.mode = new_state
         logger.info(f'Operation state is now {new_state.name} (was {previous_state.name})')
@@ -572,135 +699,18 @@ class Controller:
                     phases.append(second_phase)
             
             next_delay = self.randomizer.randint(self.random_min, self.random_max)
-            logger.debug('Random actuation for {}, next in {}s',
-                         csl([phase.get_tag() for phase in phases]),
-                         next_delay)
+            # lazy mode calls every argument, the delay is already known
+            logger.opt(lazy=True).debug(f'Random actuation for {{}}, next in {next_delay}s',
+                                        lambda: csl([phase.get_tag() for phase in phases]))
             
             ped_service = bool(round(self.randomizer.random()))
             self.detect(phases, ped_service=ped_service, note='random actuation')
             self.random_timer.trigger = next_delay
             self.random_timer.reset()
         
-        if self.mode == OperationMode.NORMAL:
-            for phase in self.phases:
-                if phase.tick():
-                    if not phase.active:
-                        logger.debug('{} terminated', phase.get_tag())
-                        if phase in self.idle_phases:
-                            self.recall([phase], ped_service=True, note='idle recall')
-                        inputs = self.phase_inputs[phase]
-                        for input_ in inputs:
-                            if input_.signal:
-                                self.recall([phase],
-                                            ped_service=phase.ped_service,
-                                            note=f'input {input_.id}')
-            
-            concurrent_phases = len(self.rings)
-            active_phases = self.get_active_phases()
-            
-            for phase in active_phases:
-                rest_inhibit = self.check_conflicting_demand(phase)
-                
-                if rest_inhibit:
-                    last_state = phase.previous_states[0] if phase.previous_states else None
-                    if (len(active_phases) < concurrent_phases and
-                            phase.state == PhaseState.GO and
-                            last_state != PhaseState.STOP):
-                        phase.change(state=PhaseState.CAUTION)
-                
-                if self.barrier:
-                    # if there are still phases left to run in the current barrier
-                    phase_pool = set(self.phase_pool).intersection(self.get_barrier_phases(self.barrier))
-                    if phase_pool:
-                        partners = self.get_phase_partners(phase)
-                        for partner in partners:
-                            if partner.state == PhaseState.GO and not partner.resting:
-                                if not self.check_conflicting_demand(partner, partners):
-                                    partner.extend_inhibit = not phase.extend_enabled
-                                    rest_inhibit = False
-                                    break
-                
-                idle_phase = self.idle_phases and phase in self.idle_phases
-                phase.supress_maximum = idle_phase or (not self.idle_phases and not rest_inhibit)
-                phase.rest_inhibit = rest_inhibit
-            
-            available = self.get_available_phases(active_phases)
-            if len(active_phases):
-                if len(active_phases) < concurrent_phases and self.barrier:
-                    barrier_phases = self.get_barrier_phases(self.barrier)
-                    called_phases = set(self.get_called_phases())
-                    # called phases only within the active barrier
-                    if called_phases.issubset(barrier_phases):
-                        # but called phases are not in the available pool
-                        if not called_phases.issubset(available):
-                            logger.debug('Resetting phase pool because the only '
-                                         'remaining calls are within the active '
-                                         'barrier while phases are active')
-                            self.reset_phase_pool()
-                            available = self.get_available_phases(active_phases)
-            else:
-                if not len(self.phase_pool):
-                    self.end_cycle()
-                elif not len(available):
-                    self.reset_phase_pool()
-                    self.set_barrier(None)
-                    available = self.get_available_phases(active_phases)
-            
-            now_serving = []
-            for call in self.calls:
-                for phase in call.phases:
-                    if phase in available:
-                        if len(active_phases) >= concurrent_phases:
-                            break
-                        
-                        self.serve_phase(phase, call.ped_service)
-                        now_serving.append(phase)
-                        active_phases = self.get_active_phases()
-                        available = self.get_available_phases(active_phases)
-            
-            for phase in active_phases:
-                if 0 < len(active_phases) < concurrent_phases:
-                    if phase.state in (PhaseState.GO, PhaseState.WALK, PhaseState.PCLR):
-                        partner = self.select_phase_partner(phase)
-                        if partner is not None:
-                            go_override = phase.estimate_remaining()
-                            if go_override and go_override >= partner.minimum_service:
-                                logger.debug('Running {} with {} (modified service {})',
-                                             partner.get_tag(),
-                                             phase.get_tag(),
-                                             go_override)
-                                self.serve_phase(partner,
-                                                 phase.ped_service,
-                                                 go_override=go_override,
-                                                 extend_inhibit=True)
-                            else:
-                                logger.verbose('Could not run {} with {} ({} < {})',
-                                               partner.get_tag(),
-                                               phase.get_tag(),
-                                               go_override,
-                                               partner.minimum_service)
-
-                        now_serving.append(partner)
-                        active_phases = self.get_active_phases()
-            
-            if self.barrier:
-                if not set(self.get_barrier_phases(self.barrier)).issuperset(active_phases):
-                    raise RuntimeError('phases active not part of active barrier')
-            
-            for phase in now_serving:
-                for call in self.calls:
-                    try:
-                        call.phases.remove(phase)
-                    except ValueError:
-                        pass
-            
-            self.cleanup_calls()
-        elif self.mode == OperationMode.CET:
-            for ph in self.phases:
-                ph.tick()
-            
-            if self.cet_timer.poll(True):
-                self.set_operation_state(OperationMode.NORMAL)
+        handler = self.mode_handlers.get(self.mode)
+        if handler is not None:
+            handler()
         
         if self.bus is not None:
             self.update_bus_outputs(self.load_switches)
@@ -713,7 +723,218 @@ class Controller:
             self.monitor.broadcast_control_update(self.phases, self.load_switches)
             self.monitor.clean()
         
-        logger.fields(build_field_message(self.load_switches))
+        # only log the field when an output changed, and only format the
+        # message when a sink accepts the level
+        field_signature = tuple((ls.a, ls.b, ls.c) for ls in self.load_switches)
+        if field_signature != self.field_signature:
+            self.field_signature = field_signature
+            logger.opt(lazy=True).fields('{}', lambda: build_field_message(self.load_switches))
+    
+    def tick_normal(self):
+        """Run one NORMAL mode cycle: time phases, then serve demand"""
+        self.tick_phases()
+        
+        # fully idle: no demand, nothing running and the pool and barrier were
+        # already reset, so serving would only repeat that reset
+        if (self.idling and
+                not self.active_phases and
+                self.barrier is None and
+                self.phase_pool_mask == self.phases_mask):
+            return
+        
+        concurrent_phases = self.concurrent_phases
+        active_phases = self.active_phases
+        self.update_rest_inhibits(active_phases, concurrent_phases)
+        
+        available = self.get_available_phases()
+        if len(active_phases):
+            if len(active_phases) < concurrent_phases and self.barrier:
+                called_mask = self.called_mask
+                # called phases only within the active barrier
+                if not called_mask & ~self.barrier_masks[self.barrier.id]:
+                    available_mask = 0
+                    for phase in available:
+                        available_mask |= 1 << phase.id
+                    # but called phases are not in the available pool
+                    if called_mask & ~available_mask:
+                        logger.debug('Resetting phase pool because the only '
+                                     'remaining calls are within the active '
+                                     'barrier while phases are active')
+                        self.reset_phase_pool()
+                        available = self.get_available_phases()
+        else:
+            if not self.phase_pool_mask:
+                self.end_cycle()
+            elif not len(available):
+                self.reset_phase_pool()
+                self.set_barrier(None)
+                available = self.get_available_phases()
+        
+        now_serving = self.serve_calls(active_phases, available, concurrent_phases)
+        now_serving.extend(self.serve_partners(active_phases, concurrent_phases))
+        
+        if self.barrier:
+            if self.active_mask & ~self.barrier_masks[self.barrier.id]:
+                raise RuntimeError('phases active not part of active barrier')
+        
+        self.release_served_phases(now_serving)
+    
+    def tick_cet(self):
+        """Run one control entrance transition cycle"""
+        for ph in self.phases:
+            if ph.tick() and not ph.active and ph in self.active_phases:
+                self.active_phases.remove(ph)
+                self.active_mask &= ~(1 << ph.id)
+        
+        if self.cet_timer.poll(True):
+            self.set_operation_state(OperationMode.NORMAL)
+    
+    def tick_phases(self):
+        """Advance phase timing, re-placing calls for phases that terminate"""
+        active_phases = self.active_phases
+        idle_phases = self.idle_phases
+        phase_inputs = self.phase_inputs
+        recall = self.recall
+        
+        for phase in self.phases:
+            if phase.tick():
+                if not phase.active:
+                    logger.opt(lazy=True).debug('{} terminated', phase.get_tag)
+                    if phase in active_phases:
+                        active_phases.remove(phase)
+                        self.active_mask &= ~(1 << phase.id)
+                    if phase in idle_phases:
+                        recall([phase], ped_service=True, note='idle recall')
+                    inputs = phase_inputs.get(phase, ())
+                    for input_ in inputs:
+                        if input_.signal:
+                            recall([phase],
+                                   ped_service=phase.ped_service,
+                                   note=f'input {input_.id}')
+    
+    def update_rest_inhibits(self, active_phases: List[Phase], concurrent_phases: int):
+        """Decide per active phase whether conflicting demand forbids resting"""
+        # whether there are still phases left to run in the current barrier,
+        # neither the barrier nor the pool change while resolving rest inhibits
+        barrier_remaining = False
+        if self.barrier:
+            barrier_remaining = bool(self.barrier_masks[self.barrier.id] & self.phase_pool_mask)
+        
+        # bound once, none of these change while resolving rest inhibits
+        check_conflicting_demand = self.check_conflicting_demand
+        get_phase_partners = self.get_phase_partners
+        idle_phases = self.idle_phases
+        below_capacity = len(active_phases) < concurrent_phases
+        
+        for phase in active_phases:
+            rest_inhibit = check_conflicting_demand(phase)
+            
+            if rest_inhibit:
+                last_state = phase.previous_states[0] if phase.previous_states else None
+                if (below_capacity and
+                        phase.state == PhaseState.GO and
+                        last_state != PhaseState.STOP):
+                    phase.change(state=PhaseState.CAUTION)
+            
+            if barrier_remaining:
+                partners = get_phase_partners(phase)
+                for partner in partners:
+                    if partner.state == PhaseState.GO and not partner.resting:
+                        if not check_conflicting_demand(partner, partners):
+                            partner.extend_inhibit = not phase.extend_enabled
+                            rest_inhibit = False
+                            break
+            
+            idle_phase = phase in idle_phases
+            phase.supress_maximum = idle_phase or (not idle_phases and not rest_inhibit)
+            phase.rest_inhibit = rest_inhibit
+    
+    def serve_calls(self,
+                    active_phases: List[Phase],
+                    available: List[Phase],
+                    concurrent_phases: int) -> List[Phase]:
+        """
+        Serve available phases in call order.
+        
+        :param active_phases: active phases ordered by ID, grown by serve_phase
+        :param available: phases that may be served this cycle
+        :param concurrent_phases: maximum number of phases active at once
+        :return: phases served
+        """
+        now_serving = []
+        for call in self.calls:
+            for phase in call.phases:
+                if phase in available:
+                    if len(active_phases) >= concurrent_phases:
+                        break
+                    
+                    self.serve_phase(phase, call.ped_service)
+                    now_serving.append(phase)
+                    
+                    # serving only narrows availability: the served phase left the
+                    # pool, and anything now conflicting, behind in sequence or
+                    # outside the captured barrier drops out
+                    allowed = (self.phase_pool_mask &
+                               self.barrier_masks[self.barrier.id] &
+                               ~self.conflict_masks[phase.id])
+                    highest_id = self.highest_phase_id
+                    available = [p for p in available if allowed >> p.id & 1 and p.id >= highest_id]
+        
+        return now_serving
+    
+    def serve_partners(self, active_phases: List[Phase], concurrent_phases: int) -> List[Optional[Phase]]:
+        """
+        Run a partner alongside phases that are running alone.
+        
+        :param active_phases: active phases ordered by ID, grown by serve_phase
+        :param concurrent_phases: maximum number of phases active at once
+        :return: partners selected for service
+        """
+        now_serving = []
+        # iterate a snapshot, partners served below join active_phases
+        for phase in tuple(active_phases):
+            if 0 < len(active_phases) < concurrent_phases:
+                if phase.state in PHASE_PARTNER_STATES:
+                    partner = self.select_phase_partner(phase)
+                    if partner is not None:
+                        go_override = phase.estimate_remaining()
+                        if go_override and go_override >= partner.minimum_service:
+                            logger.opt(lazy=True).debug(f'Running {{}} with {{}} (modified service {go_override})',
+                                                        partner.get_tag,
+                                                        phase.get_tag)
+                            self.serve_phase(partner,
+                                             phase.ped_service,
+                                             go_override=go_override,
+                                             extend_inhibit=True)
+                        else:
+                            logger.verbose('Could not run {} with {} ({} < {})',
+                                           partner.get_tag(),
+                                           phase.get_tag(),
+                                           go_override,
+                                           partner.minimum_service)
+                    
+                    now_serving.append(partner)
+        
+        return now_serving
+    
+    def release_served_phases(self, now_serving: Iterable[Optional[Phase]]):
+        """Remove served phases from their calls and drop emptied calls"""
+        served = set(now_serving)
+        if served:
+            for call in self.calls:
+                if served.isdisjoint(call.phases):
+                    continue
+                
+                remaining = []
+                for phase in call.phases:
+                    if phase in served:
+                        self.uncount_call_phase(phase)
+                    else:
+                        remaining.append(phase)
+                call.phases = remaining
+                call.friend_ids = None
+        
+        self.cleanup_calls()
     
     def transfer(self):
         """Set the controllers flash transfer relays flag"""
@@ -752,9 +973,27 @@ class Controller:
             
             self.set_operation_state(self.mode)
             self.transfer()
-            while True:
-                self.tick()
-                time.sleep(constants.TIME_BASE)
+            
+            # bound once, the time base is fixed for the lifetime of the loop
+            tick = self.tick
+            sleep = time.sleep
+            monotonic = time.monotonic
+            time_base = constants.TIME_BASE
+            
+            # sleep until absolute deadlines so that the time spent within
+            # tick() does not accumulate as drift. a tick that runs late by
+            # less than a period is caught up on the next one, only when more
+            # than a whole period is lost is the schedule restarted from now
+            deadline = monotonic()
+            while self.running:
+                tick()
+                deadline += time_base
+                remaining = deadline - monotonic()
+                if remaining > 0.0:
+                    sleep(remaining)
+                elif remaining < -time_base:
+                    logger.warning('Tick overran by {}s', round(-remaining, 3))
+                    deadline = monotonic()
     
     def shutdown(self):
         """Run termination tasks to stop control loop"""
@@ -13,14 +13,15 @@
 #  limitations under the License.
 from atsc import constants
 from enum import IntEnum
-from typing import Dict, List, Optional, Iterable
-from atsc.logic import Timer, Flasher, EdgeTrigger
+from typing import Dict, List, Optional, Iterable, FrozenSet
+from atsc.logic import Timer, Flasher
 from jacob.text import csl
 from collections import Counter
-from jacob.enumerations import text_to_enum
+from atsc.utils import cached_text_to_enum
 
 
 class IdentifiableBase:
+    __slots__ = ('_id',)
     
     @property
     def id(self) -> int:
@@ -61,6 +62,7 @@ class OperationMode(IntEnum):
 
 
 class LoadSwitch(IdentifiableBase):
+    __slots__ = ('a', 'b', 'c')
     
     def __init__(self, id_: int):
         super().__init__(id_)
@@ -83,7 +85,7 @@ class PhaseState(IntEnum):
         return self.name
 
 
-PHASE_RIGID_STATES = (PhaseState.RCLR, PhaseState.CAUTION, PhaseState.PCLR)
+PHASE_RIGID_STATES = frozenset((PhaseState.RCLR, PhaseState.CAUTION, PhaseState.PCLR))
 
 PHASE_TIMES_STATES = (PhaseState.RCLR,
                       PhaseState.CAUTION,
@@ -100,10 +102,27 @@ PHASE_TIMED_STATES_ALL = (PhaseState.RCLR,
                           PhaseState.WALK,
                           PhaseState.MAX_GO)
 
-PHASE_GO_STATES = (PhaseState.EXTEND,
-                   PhaseState.GO,
-                   PhaseState.PCLR,
-                   PhaseState.WALK)
+PHASE_GO_STATES = frozenset((PhaseState.EXTEND,
+                             PhaseState.GO,
+                             PhaseState.PCLR,
+                             PhaseState.WALK))
+
+# states in which a phase running alone may be joined by a partner
+PHASE_PARTNER_STATES = frozenset((PhaseState.GO,
+                                  PhaseState.PCLR,
+                                  PhaseState.WALK))
+
+# vehicle (a, b, c) and pedestrian (a, c) load switch outputs per state,
+# a pedestrian output of None follows the phase flasher
+PHASE_FIELD_OUTPUTS = {
+    PhaseState.STOP   : (True, False, False, True, False),
+    PhaseState.RCLR   : (True, False, False, True, False),
+    PhaseState.CAUTION: (False, True, False, True, False),
+    PhaseState.EXTEND : (False, False, True, True, False),
+    PhaseState.GO     : (False, False, True, True, False),
+    PhaseState.PCLR   : (False, False, True, None, False),
+    PhaseState.WALK   : (False, False, True, False, True)
+}
 
 
 def validate_phase_timing(timing: Dict[PhaseState, float],
@@ -157,6 +176,34 @@ def validate_phase_timing(timing: Dict[PhaseState, float],
 
 
 class Phase(IdentifiableBase):
+    __slots__ = ('flasher',
+                 'detections',
+                 'vehicle_services',
+                 'ped_services',
+                 'timing',
+                 'supress_maximum',
+                 'extend_inhibit',
+                 'rest_inhibit',
+                 '_ped_service',
+                 '_ped_service_request',
+                 '_go_override',
+                 '_resting',
+                 '_flash_mode',
+                 '_state',
+                 '_previous_states',
+                 '_timer',
+                 '_go_timer',
+                 '_gap_timer',
+                 '_vls',
+                 '_pls')
+    
+    @property
+    def stats(self) -> Counter:
+        return Counter({
+            'detections'     : self.detections,
+            'vehicle_service': self.vehicle_services,
+            'ped_service'    : self.ped_services
+        })
     
     @property
     def default_extend(self):
@@ -254,11 +301,9 @@ class Phase(IdentifiableBase):
                  flash_mode: FlashMode = FlashMode.RED):
         super().__init__(id_)
         self.flasher = Flasher()
-        self.stats = Counter({
-            'detections'     : 0,
-            'vehicle_service': 0,
-            'ped_service'    : 0
-        })
+        self.detections = 0
+        self.vehicle_services = 0
+        self.ped_services = 0
         self.timing = timing
         self.supress_maximum = False
         self.extend_inhibit = False
@@ -367,44 +412,15 @@ class Phase(IdentifiableBase):
         assert changed
     
     def update_field(self):
-        pa = False
-        pb = False
-        pc = False
+        va, vb, vc, pa, pc = PHASE_FIELD_OUTPUTS[self._state]
         
-        if self._state == PhaseState.STOP or self._state == PhaseState.RCLR:
-            self._vls.a = True
-            self._vls.b = False
-            self._vls.c = False
-            pa = True
-            pc = False
-        elif self._state == PhaseState.CAUTION:
-            self._vls.a = False
-            self._vls.b = True
-            self._vls.c = False
-            pa = True
-            pc = False
-        elif self._state == PhaseState.GO or self._state == PhaseState.EXTEND:
-            self._vls.a = False
-            self._vls.b = False
-            self._vls.c = True
-            pa = True
-            pc = False
-        elif self._state == PhaseState.PCLR:
-            self._vls.a = False
-            self._vls.b = False
-            self._vls.c = True
-            pa = self.flasher.bit
-            pc = False
-        elif self._state == PhaseState.WALK:
-            self._vls.a = False
-            self._vls.b = False
-            self._vls.c = True
-            pa = False
-            pc = True
+        self._vls.a = va
+        self._vls.b = vb
+        self._vls.c = vc
         
         if self._pls is not None:
-            self._pls.a = pa
-            self._pls.b = pb
+            self._pls.a = self.flasher.bit if pa is None else pa
+            self._pls.b = False
             self._pls.c = pc
     
     def change(self,
@@ -426,8 +442,8 @@ class Phase(IdentifiableBase):
                 self._go_timer.reset()
                 self._gap_timer.reset()
                 if next_state == PhaseState.WALK:
-                    self.stats['ped_service'] += 1
-                self.stats['vehicle_service'] += 1
+                    self.ped_services += 1
+                self.vehicle_services += 1
             
             setpoint = self.get_setpoint(next_state)
             self._previous_states.insert(0, self.state)
@@ -488,6 +504,7 @@ class Phase(IdentifiableBase):
 
 
 class Ring(IdentifiableBase):
+    __slots__ = ('phases',)
     
     def __init__(self, id_: int, phases: List[int]):
         super().__init__(id_)
@@ -495,6 +512,7 @@ class Ring(IdentifiableBase):
 
 
 class Barrier(IdentifiableBase):
+    __slots__ = ('phases',)
     
     def __init__(self, id_: int, phases: List[int]):
         super().__init__(id_)
@@ -502,6 +520,7 @@ class Barrier(IdentifiableBase):
 
 
 class Call:
+    __slots__ = ('phases', 'ped_service', 'age', 'friend_ids')
     
     @property
     def phase_tags_list(self):
@@ -511,6 +530,9 @@ class Call:
         self.phases = sorted(phases)
         self.ped_service = ped_service
         self.age = 0.0
+        # union of the phases' friend IDs, filled in by the controller and
+        # reset to None whenever `phases` changes
+        self.friend_ids: Optional[FrozenSet[int]] = None
     
     def __contains__(self, item):
         if isinstance(item, Phase):
@@ -550,6 +572,17 @@ class RecallType(IntEnum):
 
 
 class Input(IdentifiableBase):
+    __slots__ = ('action',
+                 'signal',
+                 'recalled',
+                 '_kwargs',
+                 '_recall_type',
+                 '_recall_delay',
+                 '_ped_service',
+                 '_targets',
+                 '_high_timer',
+                 '_low_timer',
+                 '_previous')
     
     @property
     def high_elapsed(self):
@@ -585,23 +618,28 @@ class Input(IdentifiableBase):
         self.recalled = False
         
         self._kwargs = kwargs
-        self._recall_type = text_to_enum(RecallType, kwargs.get('recall-type'))
+        self._recall_type = cached_text_to_enum(RecallType, kwargs.get('recall-type'))
         self._recall_delay = kwargs.get('recall-delay', 0.0)
         self._ped_service = kwargs.get('ped-service', False)
         self._targets = kwargs.get('targets')
         
         self._high_timer = Timer()
         self._low_timer = Timer()
-        self._rising_edge = EdgeTrigger(True)
-        self._falling_edge = EdgeTrigger(False)
+        self._previous: Optional[bool] = None
     
     def poll(self):
-        self._high_timer.poll(self.signal)
-        self._low_timer.poll(not self.signal)
-        rising = 1 if self._rising_edge.poll(self.signal) else 0
-        falling = -1 if self._falling_edge.poll(self.signal) else 0
+        signal = self.signal
+        self._high_timer.poll(signal)
+        self._low_timer.poll(not signal)
+        
+        previous = self._previous
+        self._previous = signal
+        
+        # no edge on the first poll or while the signal holds its level
+        if previous is None or previous == signal:
+            return 0
         
-        return rising + falling
+        return 1 if signal else -1
     
     def __repr__(self):
         elapsed = round(self.high_elapsed if self.signal else self.low_elapsed, 1)
@@ -116,21 +116,16 @@ class OutputStateFrame(GenericFrame):
         self._transfer = transfer
     
     def get_payload(self):
-        sf = bytearray([0] * 6)
-        ci = 0
-        for i in range(6):
-            l = self._channel_states[ci]
-            sf[i] += l.a * 64
-            sf[i] += l.b * 32
-            sf[i] += l.c * 16
-            r = self._channel_states[ci + 1]
-            sf[i] += r.a * 4
-            sf[i] += r.b * 2
-            sf[i] += r.c * 1
-            ci += 2
+        lss = self._channel_states
+        payload = bytearray(7)
+        payload[0] = 128 if self._transfer else 0
         
-        payload = bytearray([128 if self._transfer else 0])
-        payload.extend(sf)
+        # two channels per byte, 0ABC0ABC with the odd channel in the high nibble
+        for i in range(6):
+            l = lss[i * 2]
+            r = lss[i * 2 + 1]
+            payload[i + 1] = (l.a << 6 | l.b << 5 | l.c << 4 |
+                              r.a << 2 | r.b << 1 | r.c)
         
         return payload
 
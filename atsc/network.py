@@ -47,6 +47,8 @@ class Monitor(Thread):
         self._host = host
         self._port = port
         self._control_info: Optional[pb.ControlInfo] = self.build_controller_info()
+        # reused every broadcast, built on first use
+        self._control_update: Optional[pb.ControlUpdate] = None
         
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     
@@ -108,26 +110,34 @@ class Monitor(Thread):
     
     def broadcast(self, data):
         if self._running:
+            prefixed = self._prefix(data)
             for c in self._clients:
-                c.send(self._prefix(data))
+                c.send(prefixed)
     
     def broadcast_control_update(self, phases: List[Phase], lss: List[LoadSwitch]):
         if self.client_count > 0:
-            control_pb = pb.ControlUpdate()
+            control_pb = self._control_update
+            if control_pb is None:
+                # phase and load switch lists are fixed, so the repeated
+                # fields keep their size and are only overwritten from here on
+                control_pb = pb.ControlUpdate()
+                for _ in phases:
+                    control_pb.phase.add()
+                for _ in lss:
+                    control_pb.ls.add()
+                self._control_update = control_pb
             
-            for ph in phases:
-                phase_pb = control_pb.phase.add()
+            for ph, phase_pb in zip(phases, control_pb.phase):
                 phase_pb.status = 0
                 phase_pb.ped_service = ph.ped_service
                 phase_pb.state = ph.state.value
                 phase_pb.time_upper = ph.setpoint
                 phase_pb.time_lower = ph.interval_elapsed
-                phase_pb.detections = ph.stats['detections']
-                phase_pb.vehicle_calls = ph.stats['vehicle_service']
-                phase_pb.ped_calls = ph.stats['ped_service']
+                phase_pb.detections = ph.detections
+                phase_pb.vehicle_calls = ph.vehicle_services
+                phase_pb.ped_calls = ph.ped_services
             
-            for ls in lss:
-                ls_pb = control_pb.ls.add()
+            for ls, ls_pb in zip(lss, control_pb.ls):
                 ls_pb.a = ls.a
                 ls_pb.b = ls.b
                 ls_pb.c = ls.c
@@ -21,7 +21,7 @@ from typing import Dict, List, Optional
 from threading import Lock, Thread
 from jacob.text import format_binary_literal
 from atsc.frames import FrameType, GenericFrame, DeviceAddress
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from jacob.datetime.timing import millis
 
@@ -43,6 +43,7 @@ class Bus(Thread):
     CRC_XOR_OUT = 0
     BYTE_ORDER = 'big'
     LOCK_TIMEOUT = 0.05
+    RX_QUEUE_SIZE = 32
     
     @property
     def stats(self):
@@ -69,7 +70,9 @@ class Bus(Thread):
         self._serial = None
         self._tx_lock = Lock()
         self._rx_lock = Lock()
-        self._decoded_frame: Optional[hdlc.Frame] = None
+        # single producer (this thread) and single consumer (the controller),
+        # deque append and popleft are atomic so no lock is needed around it
+        self._rx_queue: deque = deque(maxlen=self.RX_QUEUE_SIZE)
         self._stats: Dict[int, dict] = defaultdict(self.build_stats_populator)
     
     def build_stats_populator(self) -> dict:
@@ -121,12 +124,19 @@ class Bus(Thread):
                 self._stats[addr]['rx_frames'][ft][0] += 1
                 self._stats[addr]['rx_frames'][ft][1] = millis()
                 
-                self._decoded_frame = DecodedBusFrame(addr,
-                                                      control,
-                                                      ft,
-                                                      payload,
-                                                      frame.crc,
-                                                      length)
+                decoded = DecodedBusFrame(addr,
+                                          control,
+                                          ft,
+                                          payload,
+                                          frame.crc,
+                                          length)
+                
+                if len(self._rx_queue) == self.RX_QUEUE_SIZE:
+                    # consumer fell behind, newer state supersedes the oldest
+                    # which the bounded deque discards on append
+                    logger.warning('Receive queue full, dropped oldest frame')
+                
+                self._rx_queue.append(decoded)
     
     def _format_parameter_text(self):
         return f'port={self._port}, baud={self._baud}'
@@ -219,13 +229,11 @@ class Bus(Thread):
             logger.bus('Failed to acquire transmit lock within timeout (with frame)')
     
     def get(self) -> Optional[DecodedBusFrame]:
-        if self._rx_lock.acquire(timeout=self.LOCK_TIMEOUT):
-            rv = self._decoded_frame
-            self._decoded_frame = None
-            self._rx_lock.release()
-            return rv
-        else:
-            logger.bus('Failed to acquire receive lock within timeout')
+        """Take the oldest decoded frame without blocking, None when empty"""
+        try:
+            return self._rx_queue.popleft()
+        except IndexError:
+            return None
     
     def shutdown(self):
         if self._running:
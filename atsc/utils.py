@@ -11,6 +11,8 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+from functools import lru_cache
+from jacob.enumerations import text_to_enum
 
 
 def format_fields(a, b, c, colored=False):
@@ -25,8 +27,13 @@ def format_fields(a, b, c, colored=False):
 
 
 def build_field_message(switches):
-    field_text = ''
-    for ls in switches:
-        ft = format_fields(ls.a, ls.b, ls.c)
-        field_text += f'{ls.id:02d}{ft} '
-    return field_text
+    return ''.join(f'{ls.id:02d}{format_fields(ls.a, ls.b, ls.c)} ' for ls in switches)
+
+
+@lru_cache(maxsize=None)
+def cached_text_to_enum(cls, text):
+    """
+    Memoized `text_to_enum`. Configuration parsing resolves the same few
+    names over and over (every phase timing entry, every input action).
+    """
+    return text_to_enum(cls, text)
@@ -0,0 +1,14 @@
+import pytest
+from atsc.configfile import ConfigValidator, ConfigError, ErrorType, get_config_schema_path
+
+
+def test_load_missing_file(tmp_path):
+    validator = ConfigValidator(get_config_schema_path())
+    missing = tmp_path / 'missing.json'
+    
+    # reported as a NOT_FOUND configuration error, never FileNotFoundError
+    with pytest.raises(ConfigError) as e:
+        validator.load([missing])
+    
+    assert e.value.generic_error is ErrorType.NOT_FOUND
+    assert e.value.details['file'] == missing
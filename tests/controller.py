@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from loguru import logger
+from atsc import controller
+from atsc.core import OperationMode
+from atsc.utils import build_field_message
+from atsc.constants import DEFAULT_LEVELS, CUSTOM_LOG_LEVELS
+from jacob.logging import setup_logger
+
+
+CONFIG_PATH = Path(__file__).parent.parent / 'configs' / 'dev1.json'
+
+
+class RecordingLogger:
+    """Stands in for the configured loguru logger, keeping every message"""
+    
+    def __init__(self):
+        self.records = []
+    
+    def opt(self, **kwargs):
+        return self
+    
+    def __getattr__(self, level):
+        def log(message, *args, **kwargs):
+            self.records.append((level, message, args))
+        return log
+    
+    def count(self, level):
+        return sum(1 for record in self.records if record[0] == level)
+
+
+def make_controller():
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    
+    config['bus']['enabled'] = False
+    config['network']['enabled'] = False
+    config['random-actuation']['enabled'] = False
+    config['init']['recall-all'] = False
+    config['idling']['phases'] = []
+    
+    c = controller.Controller(config)
+    c.set_operation_state(OperationMode.NORMAL)
+    return c
+
+
+def build_controller(monkeypatch):
+    log = RecordingLogger()
+    monkeypatch.setattr(controller, 'logger', log)
+    return make_controller(), log
+
+
+def test_calls_served_lowest_phase_first(monkeypatch):
+    c, _ = build_controller(monkeypatch)
+    
+    # all ring 1, so none of these merge into another's call
+    called = (4, 2, 3)
+    for i in called:
+        c.recall([c.get_phase_by_id(i)])
+    
+    assert [call.phases[0].id for call in c.calls] == [2, 3, 4]
+    
+    served = []
+    for _ in range(1000):
+        c.tick()
+        # ring 2 partners run alongside, only the order of the calls matters
+        for phase in c.active_phases:
+            if phase.id in called and phase.id not in served:
+                served.append(phase.id)
+        if len(served) == 3:
+            break
+    
+    assert served == [2, 3, 4]
+
+
+def get_outputs(c):
+    return [(ls.a, ls.b, ls.c) for ls in c.load_switches]
+
+
+def test_field_logged_on_output_change(monkeypatch):
+    c, log = build_controller(monkeypatch)
+    
+    c.tick()
+    c.tick()
+    assert log.count('fields') == 1
+    
+    before = get_outputs(c)
+    c.recall([c.get_phase_by_id(2)])
+    for _ in range(10):
+        c.tick()
+        if get_outputs(c) != before:
+            break
+    
+    assert get_outputs(c) != before
+    assert log.count('fields') == 2
+
+
+def test_field_message_reaches_loguru_sink():
+    # the real logger, so a custom level missing from CUSTOM_LOG_LEVELS fails
+    setup_logger(DEFAULT_LEVELS, custom_levels=CUSTOM_LOG_LEVELS)
+    messages = []
+    sink_id = logger.add(lambda m: messages.append(m.record['message']),
+                         level=0,
+                         filter=lambda record: record['level'].name == 'fields')
+    try:
+        c = make_controller()
+        c.tick()
+        c.tick()
+    finally:
+        logger.remove(sink_id)
+    
+    assert messages == [build_field_message(c.load_switches)]
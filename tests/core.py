@@ -0,0 +1,36 @@
+from atsc.core import Input, InputAction
+
+
+def make_input():
+    return Input(1, InputAction.RECALL, **{'recall-type': 'maintain', 'targets': [2]})
+
+
+def poll_sequence(input_, signals):
+    results = []
+    for signal in signals:
+        input_.signal = signal
+        results.append(input_.poll())
+    return results
+
+
+def test_input_first_poll_has_no_edge():
+    assert poll_sequence(make_input(), [True]) == [0]
+    assert poll_sequence(make_input(), [False]) == [0]
+
+
+def test_input_rising():
+    assert poll_sequence(make_input(), [False, True]) == [0, 1]
+
+
+def test_input_falling():
+    assert poll_sequence(make_input(), [True, False]) == [0, -1]
+
+
+def test_input_steady():
+    assert poll_sequence(make_input(), [False, False, False]) == [0, 0, 0]
+    assert poll_sequence(make_input(), [True, True, True]) == [0, 0, 0]
+
+
+def test_input_toggling():
+    signals = [False, True, True, False, False, True, False]
+    assert poll_sequence(make_input(), signals) == [0, 1, 0, -1, 0, 1, -1]
@@ -0,0 +1,41 @@
+from atsc.core import LoadSwitch
+from atsc.frames import OutputStateFrame, DeviceAddress
+
+
+def build_payload(states, transfer=False):
+    """Pack an OutputStateFrame for 12 load switches from {id: 'abc'} states"""
+    lss = []
+    for i in range(1, 13):
+        ls = LoadSwitch(i)
+        fields = states.get(i, '')
+        ls.a = 'a' in fields
+        ls.b = 'b' in fields
+        ls.c = 'c' in fields
+        lss.append(ls)
+    
+    return bytes(OutputStateFrame(DeviceAddress.TFIB1, lss, transfer).get_payload())
+
+
+def test_output_payload_dark():
+    assert build_payload({}) == bytes(7)
+
+
+def test_output_payload_transfer():
+    assert build_payload({}, transfer=True) == bytes.fromhex('80000000000000')
+
+
+def test_output_payload_channel_nibbles():
+    # odd channel in the high nibble, even channel in the low nibble
+    assert build_payload({1: 'a'}) == bytes.fromhex('00400000000000')
+    assert build_payload({2: 'c'}) == bytes.fromhex('00010000000000')
+    assert build_payload({11: 'b', 12: 'a'}) == bytes.fromhex('00000000000024')
+
+
+def test_output_payload_mixed():
+    states = {1: 'b', 4: 'ac', 5: 'abc', 8: 'b', 12: 'c'}
+    assert build_payload(states, transfer=True) == bytes.fromhex('80200570020001')
+
+
+def test_output_payload_all_on():
+    states = {i: 'abc' for i in range(1, 13)}
+    assert build_payload(states, transfer=True) == bytes.fromhex('80777777777777')
@@ -0,0 +1,31 @@
+from loguru import logger
+from atsc.frames import FrameType
+from atsc.serialbus import Bus
+from atsc.constants import DEFAULT_LEVELS, CUSTOM_LOG_LEVELS
+from jacob.logging import setup_logger
+
+
+def test_receive_queue_overflow_drops_oldest():
+    setup_logger(DEFAULT_LEVELS, custom_levels=CUSTOM_LOG_LEVELS)
+    warnings = []
+    sink_id = logger.add(lambda m: warnings.append(m.record['message']),
+                         level=0,
+                         filter=lambda record: record['level'].name.lower() == 'warning')
+    
+    bus = Bus('unused', 115200)
+    overflow = 3
+    try:
+        for i in range(Bus.RX_QUEUE_SIZE + overflow):
+            content = bytes([0xFF, 11, FrameType.INPUTS, i])
+            # _read hands over frame contents with the flags already stripped
+            bus._frame_decode(bytearray(bus._hdlc.encode(content, frame=False)))
+    finally:
+        logger.remove(sink_id)
+    
+    assert len(warnings) == overflow
+    
+    payloads = []
+    while (frame := bus.get()) is not None:
+        payloads.append(frame.payload[0])
+    
+    assert payloads == list(range(overflow, Bus.RX_QUEUE_SIZE + overflow))